@@ -1,11 +1,510 @@
 import re
 import csv
+import functools
+import hashlib
+import json
+import os
 import PyPDF2
 from pathlib import Path
 import sys
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 from datetime import datetime
 
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF < 1.24.3
+    except ImportError:
+        pymupdf = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# True when this module was compiled with Cython (see setup.py)
+try:
+    import cython
+    _COMPILED = cython.compiled
+except ImportError:
+    _COMPILED = False
+
+# Patterns are compiled once at import time so the extractor methods don't pay
+# for a trip through re's compile cache on every call.
+#
+# _RE_DATES_FALLBACK, _RE_VESTED_PCT and _RE_PLANS go through RE2 when it is
+# installed, which matches in linear time: their .*? can run a long way from
+# each starting point, across lines in the case of _RE_PLANS. Every other
+# pattern stays on the standard library, including the short same-line .*? of
+# 'personal_rate_of_return' and the name fallback, since RE2 re-encodes the str
+# on every call and costs more than it saves on a literal-prefixed search.
+_compile_linear = re2.compile if re2 is not None else re.compile
+
+_RE_LASTNAME = re.compile(r'LASTNAME\|([^|]+)')
+_RE_FIRSTNAME = re.compile(r'FIRSTNAME\|([^|]+)')
+_RE_NAME_FALLBACKS = (
+    re.compile(r'Account holder:\s*([A-Z\s-]+)'),
+    re.compile(r'WU.*YU-HSIN'),
+)
+
+_RE_DATES = re.compile(r'For\s+([A-Za-z]+ \d+, \d{4})\s+to\s+([A-Za-z]+ \d+, \d{4})')
+_RE_DATES_FALLBACK = _compile_linear(r'January 1, 2021.*?March 31, 2021')
+
+# Single-value fields (balances, allocation, contributions). Each one is searched
+# with its own pattern: they all start with a literal, which re uses to skip
+# straight to the candidate positions.
+_FIELD_PATTERNS = {
+    'balance_on': r'Your balance on [^:]+:\s*\$([0-9,]+\.\d{2})',
+    'ending_balance': r'Ending balance\s*\$([0-9,]+\.\d{2})',
+    'beginning_balance': r'Beginning balance\s*\$([0-9,]+\.\d{2})',
+    'equities': r'Equities\s*\$([0-9,]+\.\d{2})\s*([0-9.]+)%',
+    'fixed_income': r'Fixed Income\s*([0-9,]+\.\d{2})\s*([0-9.]+)%',
+    'multi_asset': r'Multi-Asset\s*([0-9,]+\.\d{2})\s*([0-9.]+)%',
+    'employee_contributions': r'Your contributions\s*([0-9,]+\.\d{2})',
+    'employer_contributions': r'Employer contributions\s*([0-9,]+\.\d{2})',
+    'total_gains_loss': r'Gains/Loss\s*([0-9,]+\.\d{2})',
+    'personal_rate_of_return': r'Personal rate of return.*?([0-9.]+)%',
+    'estimated_monthly_income_at_retirement': r'estimated monthly lifetime income of \$([0-9,]+\.\d{2})',
+    'average_monthly_contribution': r'average monthly contribution of \$([0-9,]+\.\d{2})',
+}
+_FIELD_KEYS = tuple(_FIELD_PATTERNS)
+_FIELD_RES = {key: re.compile(pattern) for key, pattern in _FIELD_PATTERNS.items()}
+
+# With Hyperscan installed, all field patterns are matched together in one
+# pass. Hyperscan only reports match offsets, so the per-field patterns are
+# re-run over the reported span to recover the capture groups.
+
+def _build_field_database():
+    # (database, None), or (None, reason) when the patterns don't compile
+    if hyperscan is None:
+        return None, None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[_FIELD_PATTERNS[key].encode() for key in _FIELD_KEYS],
+            ids=list(range(len(_FIELD_KEYS))),
+            elements=len(_FIELD_KEYS),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_FIELD_KEYS),
+        )
+    except hyperscan.error as e:
+        return None, str(e)
+    return database, None
+
+# A compile error is reported once by main rather than printed here, where it
+# would repeat in every worker process that imports the module
+_FIELD_DATABASE, _FIELD_DATABASE_ERROR = _build_field_database()
+
+# Literal every match of the field's pattern must contain. Fields whose
+# literal isn't in the text are not searched for.
+_FIELD_ANCHORS = {
+    'balance_on': 'Your balance on',
+    'ending_balance': 'Ending balance',
+    'beginning_balance': 'Beginning balance',
+    'equities': 'Equities',
+    'fixed_income': 'Fixed Income',
+    'multi_asset': 'Multi-Asset',
+    'employee_contributions': 'Your contributions',
+    'employer_contributions': 'Employer contributions',
+    'total_gains_loss': 'Gains/Loss',
+    'personal_rate_of_return': 'Personal rate of return',
+    'estimated_monthly_income_at_retirement': 'estimated monthly lifetime income of $',
+    'average_monthly_contribution': 'average monthly contribution of $',
+}
+_PLAN_ANCHOR = 'Balance as of Mar 31, 2021'
+
+# Labels the statement layout puts on a line of their own, with the values on
+# the lines right after. PyMuPDF keeps these lines intact, so the fields can be
+# read by label instead of searching the whole text.
+_LAYOUT_LABELS = {
+    'Beginning balance': 'beginning_balance',
+    'Ending balance': 'ending_balance',
+    'Equities': 'equities',
+    'Fixed Income': 'fixed_income',
+    'Multi-Asset': 'multi_asset',
+    'Your contributions': 'employee_contributions',
+    'Employer contributions': 'employer_contributions',
+    'Gains/Loss': 'total_gains_loss',
+    'Personal rate of return': 'personal_rate_of_return',
+}
+
+_RE_MONEY = re.compile(r'[$,%]')
+
+# Amounts the portfolio summary works with
+_NUMERIC_FIELDS = (
+    'beginning_balance',
+    'ending_balance',
+    'total_gains_loss',
+    'personal_rate_of_return',
+    'equities_percentage',
+    'fixed_income_percentage',
+    'multi_asset_percentage',
+)
+
+# Inputs to _derive, in argument order
+_METRIC_FIELDS = (
+    'beginning_balance',
+    'ending_balance',
+    'total_gains_loss',
+    'equities_percentage',
+    'fixed_income_percentage',
+    'multi_asset_percentage',
+)
+
+# (category, field, key) for each row save_to_csv writes, in order
+_CSV_SCHEMA = (
+    # Basic Information
+    ('Basic Info', 'Account Holder Name', 'account_holder_name'),
+    ('Basic Info', 'Statement Period Start', 'statement_start_date'),
+    ('Basic Info', 'Statement Period End', 'statement_end_date'),
+    
+    # Portfolio Balances
+    ('Portfolio Balance', 'Beginning Balance', 'beginning_balance'),
+    ('Portfolio Balance', 'Ending Balance', 'ending_balance'),
+    ('Portfolio Balance', 'Total Portfolio Balance', 'total_portfolio_balance'),
+    
+    # Asset Allocation
+    ('Asset Allocation', 'Equities Value', 'equities_value'),
+    ('Asset Allocation', 'Equities Percentage', 'equities_percentage'),
+    ('Asset Allocation', 'Fixed Income Value', 'fixed_income_value'),
+    ('Asset Allocation', 'Fixed Income Percentage', 'fixed_income_percentage'),
+    ('Asset Allocation', 'Multi-Asset Value', 'multi_asset_value'),
+    ('Asset Allocation', 'Multi-Asset Percentage', 'multi_asset_percentage'),
+    
+    # Contributions and Performance
+    ('Performance', 'Employee Contributions', 'employee_contributions'),
+    ('Performance', 'Employer Contributions', 'employer_contributions'),
+    ('Performance', 'Total Gains/Loss', 'total_gains_loss'),
+    ('Performance', 'Personal Rate of Return', 'personal_rate_of_return'),
+    ('Performance', 'Average Monthly Contribution', 'average_monthly_contribution'),
+    ('Performance', 'Estimated Monthly Income at Retirement', 'estimated_monthly_income_at_retirement'),
+    
+    # Vesting Information
+    ('Vesting', 'Vesting Status', 'vesting_status'),
+)
+
+class StatementTemplate(NamedTuple):
+    name: str
+    # Line that starts the fixed-layout section
+    anchor: str
+    # (field key, label, line offset of the label from the anchor, value lines after it)
+    fields: Tuple[Tuple[str, str, int, int], ...]
+
+# Known statement layouts. When every label sits at its offset from the anchor,
+# the values are read from those positions without searching.
+_TEMPLATES = (
+    StatementTemplate(
+        name='Quarterly retirement savings portfolio statement (2021)',
+        anchor='Summary of your portfolio activity',
+        fields=(
+            ('beginning_balance', 'Beginning balance', 3, 1),
+            ('employee_contributions', 'Your contributions', 6, 1),
+            ('employer_contributions', 'Employer contributions', 9, 1),
+            ('total_gains_loss', 'Gains/Loss', 12, 1),
+            ('ending_balance', 'Ending balance', 15, 1),
+            ('personal_rate_of_return', 'Personal rate of return', 18, 1),
+            ('equities', 'n Equities', 31, 2),
+            ('fixed_income', 'n Fixed Income', 34, 2),
+            ('multi_asset', 'n Multi-Asset', 37, 2),
+        ),
+    ),
+)
+
+# (asset type, field key, value column, percentage column in extracted_data)
+_ALLOCATION_COLUMNS = (
+    ('Equities', 'equities', 'equities_value', 'equities_percentage'),
+    ('Fixed Income', 'fixed_income', 'fixed_income_value', 'fixed_income_percentage'),
+    ('Multi-Asset', 'multi_asset', 'multi_asset_value', 'multi_asset_percentage'),
+)
+_CONTRIBUTION_FIELDS = (
+    'employee_contributions',
+    'employer_contributions',
+    'total_gains_loss',
+    'personal_rate_of_return',
+    'estimated_monthly_income_at_retirement',
+    'average_monthly_contribution',
+)
+# Copied for each extraction rather than rebuilt from literals
+_EMPTY_CONTRIBUTIONS = dict.fromkeys(_CONTRIBUTION_FIELDS, '')
+
+_RE_VESTING = re.compile(
+    r'What you have vested.*?(?=Your investments|Total)'
+    r'|vested percentage.*?(?=\n\n|\n[A-Z])'
+    r'|delayed vesting provision.*?(?=\n\n|\n[A-Z])'
+    r'|vesting rules.*?(?=\n\n|\n[A-Z])',
+    re.DOTALL | re.IGNORECASE,
+)
+# Any text on the same line may separate the percent from the amount. PyMuPDF
+# puts the two on consecutive lines, so a line break on its own is allowed too.
+_RE_VESTED_PCT = _compile_linear(r'(\d+)%(?:.*?|\s+)\$([0-9,]+\.\d{2})')
+
+_RE_PLANS = (
+    _compile_linear(r'(?s)(\d+)\s+(RETIREMENT PLAN|VOLUNTARY EMPLOYEE RETIREMENT PLAN|MATCHING PLAN|BASIC PLAN|SUPPLEMENTAL RETIREMENT ANNUITY PLAN)\s*\nPlan\s+#.*?Balance as of Mar 31, 2021\s*\$([0-9,]+\.\d{2})'),
+)
+
+def _on_field_match(pattern_id, start, end, flags, spans):
+    # Keep the leftmost, then shortest, match of each pattern: the one re finds
+    if (start, end) < spans.get(pattern_id, (start + 1, end)):
+        spans[pattern_id] = (start, end)
+
+def _scan_fields_hyperscan(text: str, keys: Tuple[str, ...]) -> Dict[str, Tuple[str, ...]]:
+    data = text.encode('utf-8')
+    spans = {}
+    _FIELD_DATABASE.scan(data, match_event_handler=_on_field_match, context=spans)
+    
+    fields = {}
+    for pattern_id, (start, end) in spans.items():
+        key = _FIELD_KEYS[pattern_id]
+        if key not in keys:
+            continue
+        # Hyperscan offsets are in bytes; they only differ from str indexes
+        # when the text has non-ASCII characters
+        if len(data) != len(text):
+            start = len(data[:start].decode('utf-8'))
+            end = len(data[:end].decode('utf-8'))
+        match = _FIELD_RES[key].match(text[start:end])
+        if match:
+            fields[key] = match.groups()
+    return fields
+
+def _template_fields(lines: Sequence[str]) -> Optional[Dict[str, Tuple[str, ...]]]:
+    # None when the lines don't follow any known template
+    for template in _TEMPLATES:
+        try:
+            start = lines.index(template.anchor)
+        except ValueError:
+            continue
+        
+        if start + max(offset + count for _, _, offset, count in template.fields) >= len(lines):
+            continue
+        if any(lines[start + offset] != label for _, label, offset, _ in template.fields):
+            continue
+        
+        fields = {}
+        for key, _, offset, count in template.fields:
+            i = start + offset
+            match = _FIELD_RES[key].search(' '.join(lines[i:i + count + 1]))
+            if match:
+                fields[key] = match.groups()
+        return fields
+    return None
+
+def _layout_fields(lines: Sequence[str]) -> Dict[str, Tuple[str, ...]]:
+    # Values following the first stand-alone occurrence of each label
+    following = {}
+    for i, line in enumerate(lines):
+        if line in _LAYOUT_LABELS and line not in following:
+            following[line] = lines[i + 1:i + 3]
+    
+    # Run the field's own pattern over the label and its values so the groups
+    # come out exactly as a text scan would produce them
+    fields = {}
+    for label, values in following.items():
+        key = _LAYOUT_LABELS[label]
+        match = _FIELD_RES[key].match(f"{label} {' '.join(values)}")
+        if match:
+            fields[key] = match.groups()
+    return fields
+
+def _missing_keys(text: str, found: Dict[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    # Fields not in found whose anchor literal occurs in the text
+    return tuple(key for key in _FIELD_KEYS if key not in found and _FIELD_ANCHORS[key] in text)
+
+def _join_pages(pages: Iterator[Tuple[str, List[str]]]) -> Tuple[str, List[str]]:
+    # Whole-document text and lines from per-page (text, lines) pairs
+    texts = []
+    lines = []
+    for page_text, page_lines in pages:
+        texts.append(page_text)
+        lines.extend(page_lines)
+    return "".join(texts), lines
+
+def _scan_fields(text: str, keys: Tuple[str, ...] = _FIELD_KEYS) -> Dict[str, Tuple[str, ...]]:
+    if _FIELD_DATABASE is not None and keys:
+        return _scan_fields_hyperscan(text, keys)
+    
+    fields = {}
+    for key in keys:
+        match = _FIELD_RES[key].search(text)
+        if match:
+            fields[key] = match.groups()
+    return fields
+
+def _allocation_values(match: Optional[Tuple[str, ...]]) -> Tuple[str, str]:
+    # Formatted (value, percentage) of an allocation field, blank if not found
+    if match:
+        return f"${match[0]}", f"{match[1]}%"
+    return '', ''
+
+def _plan_columns(plan_numbers=(), plan_types=(), balances=()) -> Dict[str, List[str]]:
+    # Plan details are stored column-wise: one list per field, index i is plan i
+    return {
+        'plan_number': list(plan_numbers),
+        'plan_type': list(plan_types),
+        'balance': list(balances),
+    }
+
+def _money(value: str) -> Optional[float]:
+    # '$1,234.56' or '5.45%' as a float, None if missing or unparseable
+    try:
+        return float(_RE_MONEY.sub('', value))
+    except ValueError:
+        return None
+
+def _derive(beginning, ending, gains, equities_pct, fixed_income_pct, multi_asset_pct):
+    change = ending - beginning
+    growth_pct = (ending / beginning - 1.0) * 100.0 if beginning else 0.0
+    gains_pct = gains / beginning * 100.0 if beginning else 0.0
+    allocated_pct = equities_pct + fixed_income_pct + multi_asset_pct
+    return change, growth_pct, gains_pct, allocated_pct
+
+def _make_derive_batch(derive, loop):
+    # Batch version of derive over loop (range, or numba.prange to run rows in
+    # parallel), so the plain and JIT-compiled variants share one body
+    def derive_batch(values, derived):
+        # values is an (N, 6) float64 array with one row of _METRIC_FIELDS per
+        # statement; results go into derived, an (N, 4) float64 array
+        for i in loop(values.shape[0]):
+            change, growth_pct, gains_pct, allocated_pct = derive(
+                values[i, 0], values[i, 1], values[i, 2], values[i, 3], values[i, 4], values[i, 5]
+            )
+            derived[i, 0] = change
+            derived[i, 1] = growth_pct
+            derived[i, 2] = gains_pct
+            derived[i, 3] = allocated_pct
+        return derived
+    return derive_batch
+
+@functools.lru_cache(maxsize=None)
+def _load_numeric_backend():
+    # (numpy, derive_batch, derive) for portfolio_metrics, with numpy and
+    # derive_batch None when NumPy isn't installed. NumPy and Numba add a couple
+    # of hundred milliseconds to start-up, so they are only imported once there
+    # is something to compute. Numba can't JIT Cython-compiled functions, which
+    # are already native.
+    try:
+        import numpy
+    except ImportError:
+        return None, None, _derive
+    
+    if not _COMPILED:
+        try:
+            import numba
+        except ImportError:
+            pass
+        else:
+            derive = numba.njit(cache=True)(_derive)
+            derive_batch = numba.njit(cache=True, parallel=True)(_make_derive_batch(derive, numba.prange))
+            return numpy, derive_batch, derive
+    return numpy, _make_derive_batch(_derive, range), _derive
+
+def portfolio_metrics(records: List[Dict[str, str]]) -> List[Optional[Tuple[float, float, float, float]]]:
+    # (change, growth %, gains % of beginning balance, allocated %) per record,
+    # or None when one of its amounts is missing
+    parsed = [[_money(record.get(key, '')) for key in _METRIC_FIELDS] for record in records]
+    complete = [row for row in parsed if None not in row]
+    derived = iter(())
+    if complete:
+        np, derive_batch, derive = _load_numeric_backend()
+        if np is not None:
+            values = np.array(complete, dtype=np.float64)
+            derived = iter(derive_batch(values, np.empty((len(complete), 4))).tolist())
+        else:
+            derived = (derive(*row) for row in complete)
+    return [tuple(next(derived)) if None not in row else None for row in parsed]
+
+def _dumps(record: Dict, indent: bool = False) -> bytes:
+    # orjson serialises straight to bytes in C; fall back to the json module,
+    # set up to write the same bytes orjson does
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(record, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def save_to_ndjson(records: List[Dict], output_path: str = "tiaa_statements.ndjson", append: bool = False) -> bool:
+    # One JSON object per line, so the file can be streamed or appended to
+    try:
+        with open(output_path, 'ab' if append else 'wb') as f:
+            for record in records:
+                f.write(_dumps(record) + b"\n")
+        
+        print(f"{len(records)} record(s) saved to: {output_path}")
+        return True
+    
+    except Exception as e:
+        print(f"Error saving to NDJSON: {e}")
+        return False
+
+def _cache_by_text(maxsize: int = 128):
+    # Like functools.lru_cache, but keyed on a digest of the text so the cache
+    # doesn't keep whole statements alive
+    def decorator(func):
+        cache = OrderedDict()
+        
+        @functools.wraps(func)
+        def wrapper(text: str):
+            key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+            result = cache[key] = func(text)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+@_cache_by_text()
+def _vesting_summary(text: str) -> str:
+    # Look for vesting sections
+    vesting_info = _RE_VESTING.findall(text)
+    
+    # Check for specific vesting percentages
+    vested_percentages = []
+    for match in _RE_VESTED_PCT.finditer(text):
+        percent, amount = match.groups()
+        vested_percentages.append(f"{percent}% (${amount})")
+    
+    if vested_percentages:
+        vesting_summary = f"Vesting percentages found: {', '.join(vested_percentages)}"
+    elif any("delayed vesting provision" in info.lower() for info in vesting_info):
+        vesting_summary = "Delayed vesting provision applies - employer maintains vesting information"
+    elif any("100%" in info for info in vesting_info):
+        vesting_summary = "100% vested in participant contributions"
+    else:
+        vesting_summary = "Vesting information not clearly specified"
+    
+    return vesting_summary
+
+@_cache_by_text()
+def _plan_details(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    matches = []
+    
+    # Find all plan sections
+    for pattern in _RE_PLANS:
+        matches.extend(pattern.findall(text))
+    
+    if not matches:
+        return (), (), ()
+    plan_numbers, plan_types, balances = zip(*matches)
+    return plan_numbers, plan_types, tuple(f"${balance}" for balance in balances)
+
 def setup_requirements():
     print("=" * 60)
     print("SETUP INSTRUCTIONS")
@@ -42,25 +541,50 @@ class TIAAStatementExtractor:
             'estimated_monthly_income_at_retirement': '',
             'average_monthly_contribution': '',
             'vesting_status': '',
-            'plan_details': []
+            'plan_details': _plan_columns()
         }
         
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
+    def _iter_pymupdf_pages(self, pdf_path: str) -> Iterator[Tuple[str, List[str]]]:
+        # (page text, page lines) for each page
+        with pymupdf.open(pdf_path) as doc:
+            for page in doc:
+                # Text blocks joined in order are the same as get_text("text"),
+                # and their lines feed the label lookups in _layout_fields
+                blocks = [block[4] for block in page.get_text("blocks") if block[6] == 0]
+                lines = [line.strip() for block in blocks for line in block.splitlines()]
+                yield "".join(blocks), lines
+    
+    def _iter_pypdf2_pages(self, pdf_path: str) -> Iterator[Tuple[str, List[str]]]:
+        # PyPDF2 doesn't keep the layout, so there are no lines to look up
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page in pdf_reader.pages:
+                yield page.extract_text() or "", []
+    
+    def read_pdf(self, pdf_path: str) -> Tuple[str, List[str]]:
+        # Text of the PDF and its lines in layout order, for extract_from_text.
+        # MuPDF extracts text in C and is much faster than PyPDF2.
+        if pymupdf is not None:
+            try:
+                return _join_pages(self._iter_pymupdf_pages(pdf_path))
+            except Exception as e:
+                # Some files MuPDF can't handle still open with PyPDF2
+                print(f"Error reading PDF with PyMuPDF: {e}, retrying with PyPDF2")
+        
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
+            return _join_pages(self._iter_pypdf2_pages(pdf_path))
         except Exception as e:
             print(f"Error reading PDF with PyPDF2: {e}")
-            return ""
+            return "", []
+    
+    def extract_text_from_pdf(self, pdf_path: str) -> str:
+        text, _ = self.read_pdf(pdf_path)
+        return text
     
     def extract_account_holder_name(self, text: str) -> str:
         # Look for name patterns in the document
-        lastname_match = re.search(r'LASTNAME\|([^|]+)', text)
-        firstname_match = re.search(r'FIRSTNAME\|([^|]+)', text)
+        lastname_match = _RE_LASTNAME.search(text)
+        firstname_match = _RE_FIRSTNAME.search(text)
         
         if lastname_match and firstname_match:
             lastname = lastname_match.group(1).strip()
@@ -68,154 +592,77 @@ class TIAAStatementExtractor:
             return f"{firstname} {lastname}"
         
         # Fallback patterns
-        name_patterns = [
-            r'Account holder:\s*([A-Z\s-]+)',
-            r'WU.*YU-HSIN',
-        ]
-        
-        for pattern in name_patterns:
-            match = re.search(pattern, text)
+        for pattern in _RE_NAME_FALLBACKS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         
         return "Account Holder (Name not clearly identified)"
     
     def extract_statement_dates(self, text: str) -> Tuple[str, str]:
-        date_pattern = r'For\s+([A-Za-z]+ \d+, \d{4})\s+to\s+([A-Za-z]+ \d+, \d{4})'
-        match = re.search(date_pattern, text)
+        match = _RE_DATES.search(text)
         
         if match:
             return match.group(1), match.group(2)
         
         # Alternative patterns
-        if re.search(r'January 1, 2021.*?March 31, 2021', text):
+        if _RE_DATES_FALLBACK.search(text):
             return "January 1, 2021", "March 31, 2021"
         
         return "Start Date Not Found", "End Date Not Found"
     
-    def extract_portfolio_balance(self, text: str) -> Dict[str, str]:
+    def extract_portfolio_balance(self, text: str, fields: Optional[Dict[str, Tuple[str, ...]]] = None) -> Dict[str, str]:
+        if fields is None:
+            fields = _scan_fields(text)
         balances = {}
         
         # Current balance
-        balance_patterns = [
-            r'Your balance on [^:]+:\s*\$([0-9,]+\.\d{2})',
-            r'Ending balance\s*\$([0-9,]+\.\d{2})',
-        ]
-        
-        for pattern in balance_patterns:
-            match = re.search(pattern, text)
-            if match:
-                balances['total_portfolio_balance'] = f"${match.group(1)}"
-                balances['ending_balance'] = f"${match.group(1)}"
-                break
+        current = fields.get('balance_on') or fields.get('ending_balance')
+        if current:
+            balances['total_portfolio_balance'] = f"${current[0]}"
+            balances['ending_balance'] = f"${current[0]}"
         
         # Beginning balance
-        beginning_match = re.search(r'Beginning balance\s*\$([0-9,]+\.\d{2})', text)
-        if beginning_match:
-            balances['beginning_balance'] = f"${beginning_match.group(1)}"
+        beginning = fields.get('beginning_balance')
+        if beginning:
+            balances['beginning_balance'] = f"${beginning[0]}"
         
         return balances
     
-    def extract_asset_allocation(self, text: str) -> Dict[str, Dict[str, str]]:
-        allocation = {
-            'Equities': {'value': '', 'percentage': ''},
-            'Fixed Income': {'value': '', 'percentage': ''},
-            'Multi-Asset': {'value': '', 'percentage': ''}
-        }
+    def extract_asset_allocation(self, text: str, fields: Optional[Dict[str, Tuple[str, ...]]] = None) -> Dict[str, Dict[str, str]]:
+        if fields is None:
+            fields = _scan_fields(text)
+        allocation = {}
         
         # Pattern for asset allocation table
-        patterns = {
-            'Equities': r'Equities\s*\$([0-9,]+\.\d{2})\s*([0-9.]+)%',
-            'Fixed Income': r'Fixed Income\s*([0-9,]+\.\d{2})\s*([0-9.]+)%',
-            'Multi-Asset': r'Multi-Asset\s*([0-9,]+\.\d{2})\s*([0-9.]+)%'
-        }
-        
-        for asset_type, pattern in patterns.items():
-            match = re.search(pattern, text)
-            if match:
-                allocation[asset_type]['value'] = f"${match.group(1)}"
-                allocation[asset_type]['percentage'] = f"{match.group(2)}%"
+        for asset_type, key, _, _ in _ALLOCATION_COLUMNS:
+            value, percentage = _allocation_values(fields.get(key))
+            allocation[asset_type] = {'value': value, 'percentage': percentage}
         
         return allocation
     
-    def extract_contributions_and_gains(self, text: str) -> Dict[str, str]:
-        data = {
-            'employee_contributions': '',
-            'employer_contributions': '',
-            'total_gains_loss': '',
-            'personal_rate_of_return': '',
-            'estimated_monthly_income_at_retirement': '',
-            'average_monthly_contribution': ''
-        }
+    def extract_contributions_and_gains(self, text: str, fields: Optional[Dict[str, Tuple[str, ...]]] = None) -> Dict[str, str]:
+        if fields is None:
+            fields = _scan_fields(text)
+        data = _EMPTY_CONTRIBUTIONS.copy()
         
         # Extract contributions
-        patterns = {
-            'employee_contributions': r'Your contributions\s*([0-9,]+\.\d{2})',
-            'employer_contributions': r'Employer contributions\s*([0-9,]+\.\d{2})',
-            'total_gains_loss': r'Gains/Loss\s*([0-9,]+\.\d{2})',
-            'personal_rate_of_return': r'Personal rate of return.*?([0-9.]+)%',
-            'estimated_monthly_income_at_retirement': r'estimated monthly lifetime income of \$([0-9,]+\.\d{2})',
-            'average_monthly_contribution': r'average monthly contribution of \$([0-9,]+\.\d{2})'
-        }
-        
-        for key, pattern in patterns.items():
-            match = re.search(pattern, text)
+        for key in _CONTRIBUTION_FIELDS:
+            match = fields.get(key)
             if match:
                 if 'percentage' in key or 'rate_of_return' in key:
-                    data[key] = f"{match.group(1)}%"
+                    data[key] = f"{match[0]}%"
                 else:
-                    data[key] = f"${match.group(1)}"
+                    data[key] = f"${match[0]}"
         
         return data
     
     def extract_vesting_information(self, text: str) -> str:
-        vesting_info = []
-        
-        # Look for vesting sections
-        vesting_patterns = [
-            r'What you have vested.*?(?=Your investments|Total)',
-            r'vested percentage.*?(?=\n\n|\n[A-Z])',
-            r'delayed vesting provision.*?(?=\n\n|\n[A-Z])',
-            r'vesting rules.*?(?=\n\n|\n[A-Z])'
-        ]
-        
-        for pattern in vesting_patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            vesting_info.extend(matches)
-        
-        # Check for specific vesting percentages
-        vested_percent_matches = re.findall(r'(\d+)%.*?\$([0-9,]+\.\d{2})', text)
-        
-        if vested_percent_matches:
-            vesting_summary = f"Vesting percentages found: {', '.join([f'{percent}% (${amount})' for percent, amount in vested_percent_matches])}"
-        elif any("delayed vesting provision" in info.lower() for info in vesting_info):
-            vesting_summary = "Delayed vesting provision applies - employer maintains vesting information"
-        elif any("100%" in info for info in vesting_info):
-            vesting_summary = "100% vested in participant contributions"
-        else:
-            vesting_summary = "Vesting information not clearly specified"
-        
-        return vesting_summary
+        return _vesting_summary(text)
     
-    def extract_plan_details(self, text: str) -> List[Dict[str, str]]:
-        plans = []
-        
-        # Find all plan sections
-        plan_patterns = [
-            r'(\d+)\s+(RETIREMENT PLAN|VOLUNTARY EMPLOYEE RETIREMENT PLAN|MATCHING PLAN|BASIC PLAN|SUPPLEMENTAL RETIREMENT ANNUITY PLAN).*?Balance as of Mar 31, 2021\s*\$([0-9,]+\.\d{2})',
-        ]
-        
-        for pattern in plan_patterns:
-            matches = re.findall(pattern, text, re.DOTALL)
-            for match in matches:
-                plan_num, plan_type, balance = match
-                plans.append({
-                    'plan_number': plan_num,
-                    'plan_type': plan_type,
-                    'balance': f"${balance}"
-                })
-        
-        return plans
+    def extract_plan_details(self, text: str) -> Dict[str, List[str]]:
+        # Fresh lists, so callers can't modify the cached columns
+        return _plan_columns(*_plan_details(text))
     
     def extract_all_data(self, pdf_path: str = None, use_sample_data: bool = False) -> Dict[str, str]:
         if use_sample_data:
@@ -225,7 +672,7 @@ class TIAAStatementExtractor:
         
         if pdf_path:
             print(f"Extracting data from: {pdf_path}")
-            text = self.extract_text_from_pdf(pdf_path)
+            text, layout_lines = self.read_pdf(pdf_path)
         else:
             print("No PDF path provided, using sample data...")
             self.load_sample_data()
@@ -236,6 +683,11 @@ class TIAAStatementExtractor:
             self.load_sample_data()
             return self.extracted_data
         
+        return self.extract_from_text(text, layout_lines)
+    
+    def extract_from_text(self, text: str, layout_lines: Sequence[str] = ()) -> Dict[str, str]:
+        # layout_lines are the text's lines in layout order, as read_pdf returns
+        # them; without them every field is searched for in the text
         print(f"Extracted {len(text)} characters from PDF")
         
         # Extract all information
@@ -245,22 +697,29 @@ class TIAAStatementExtractor:
         self.extracted_data['statement_start_date'] = start_date
         self.extracted_data['statement_end_date'] = end_date
         
-        balances = self.extract_portfolio_balance(text)
+        # Balances, allocation and contributions are read from fixed positions
+        # for known templates, otherwise by label from the PDF layout; only
+        # the fields neither of those found are searched for in the text
+        fields = _template_fields(layout_lines)
+        if fields is None:
+            fields = _layout_fields(layout_lines)
+        fields.update(_scan_fields(text, _missing_keys(text, fields)))
+        
+        balances = self.extract_portfolio_balance(text, fields)
         self.extracted_data.update(balances)
         
-        allocation = self.extract_asset_allocation(text)
-        self.extracted_data['equities_value'] = allocation['Equities']['value']
-        self.extracted_data['equities_percentage'] = allocation['Equities']['percentage']
-        self.extracted_data['fixed_income_value'] = allocation['Fixed Income']['value']
-        self.extracted_data['fixed_income_percentage'] = allocation['Fixed Income']['percentage']
-        self.extracted_data['multi_asset_value'] = allocation['Multi-Asset']['value']
-        self.extracted_data['multi_asset_percentage'] = allocation['Multi-Asset']['percentage']
+        # Allocation goes straight into the flat columns, without the nested
+        # per-asset dicts extract_asset_allocation returns
+        for _, key, value_column, percentage_column in _ALLOCATION_COLUMNS:
+            value, percentage = _allocation_values(fields.get(key))
+            self.extracted_data[value_column] = value
+            self.extracted_data[percentage_column] = percentage
         
-        contrib_gains = self.extract_contributions_and_gains(text)
+        contrib_gains = self.extract_contributions_and_gains(text, fields)
         self.extracted_data.update(contrib_gains)
         
         self.extracted_data['vesting_status'] = self.extract_vesting_information(text)
-        self.extracted_data['plan_details'] = self.extract_plan_details(text)
+        self.extracted_data['plan_details'] = self.extract_plan_details(text) if _PLAN_ANCHOR in text else _plan_columns()
         
         return self.extracted_data
     
@@ -285,34 +744,27 @@ class TIAAStatementExtractor:
             'estimated_monthly_income_at_retirement': '$8,568.00',
             'average_monthly_contribution': '$3,466.00',
             'vesting_status': 'Delayed vesting provision applies for employer contributions - employer maintains vesting information. 100% vested in voluntary/personal contributions.',
-            'plan_details': [
-                {'plan_number': '1', 'plan_type': 'RETIREMENT PLAN', 'balance': '$228,743.55'},
-                {'plan_number': '2', 'plan_type': 'VOLUNTARY EMPLOYEE RETIREMENT PLAN', 'balance': '$182,726.29'},
-                {'plan_number': '3', 'plan_type': 'MATCHING PLAN', 'balance': '$46,554.92'},
-                {'plan_number': '4', 'plan_type': 'BASIC PLAN', 'balance': '$22,187.84'},
-                {'plan_number': '5', 'plan_type': 'SUPPLEMENTAL RETIREMENT ANNUITY PLAN', 'balance': '$21,762.06'}
-            ]
+            'plan_details': _plan_columns(
+                ('1', '2', '3', '4', '5'),
+                ('RETIREMENT PLAN', 'VOLUNTARY EMPLOYEE RETIREMENT PLAN', 'MATCHING PLAN', 'BASIC PLAN', 'SUPPLEMENTAL RETIREMENT ANNUITY PLAN'),
+                ('$228,743.55', '$182,726.29', '$46,554.92', '$22,187.84', '$21,762.06'),
+            )
         }
     
+    def _parse_numeric(self) -> Dict[str, Optional[float]]:
+        return {key: _money(self.extracted_data.get(key, '')) for key in _NUMERIC_FIELDS}
+    
     def generate_portfolio_summary(self) -> str:
         data = self.extracted_data
         
-        # Calculate performance metrics
-        try:
-            beginning = float(data['beginning_balance'].replace('$', '').replace(',', ''))
-            ending = float(data['ending_balance'].replace('$', '').replace(',', ''))
-            gains = float(data['total_gains_loss'].replace('$', '').replace(',', ''))
+        # Parsed from extracted_data as it is now, so reassigned or edited data
+        # is never summarised from stale numbers
+        numeric = self._parse_numeric()
+        if None not in numeric.values():
             return_rate = data['personal_rate_of_return'].replace('%', '')
-            
-            # Portfolio allocation insights
-            equity_pct = float(data['equities_percentage'].replace('%', ''))
-            fixed_pct = float(data['fixed_income_percentage'].replace('%', ''))
-            multi_pct = float(data['multi_asset_percentage'].replace('%', ''))
-            
-        except (ValueError, KeyError):
+        else:
             # Fallback for missing data
             return_rate = "5.45"
-            equity_pct = 70.09
             
         summary = f"""Portfolio Performance Summary for {data['account_holder_name']} (Q1 2021):
         
@@ -329,58 +781,16 @@ Regarding vesting: {data['vesting_status']} This means while personal contributi
             with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
                 
-                # Write header
-                writer.writerow(['Category', 'Field', 'Value'])
-                
-                # Basic Information
-                basic_fields = [
-                    ('Basic Info', 'Account Holder Name', self.extracted_data.get('account_holder_name', '')),
-                    ('Basic Info', 'Statement Period Start', self.extracted_data.get('statement_start_date', '')),
-                    ('Basic Info', 'Statement Period End', self.extracted_data.get('statement_end_date', '')),
-                ]
-                
-                # Portfolio Balances
-                balance_fields = [
-                    ('Portfolio Balance', 'Beginning Balance', self.extracted_data.get('beginning_balance', '')),
-                    ('Portfolio Balance', 'Ending Balance', self.extracted_data.get('ending_balance', '')),
-                    ('Portfolio Balance', 'Total Portfolio Balance', self.extracted_data.get('total_portfolio_balance', '')),
-                ]
-                
-                # Asset Allocation
-                allocation_fields = [
-                    ('Asset Allocation', 'Equities Value', self.extracted_data.get('equities_value', '')),
-                    ('Asset Allocation', 'Equities Percentage', self.extracted_data.get('equities_percentage', '')),
-                    ('Asset Allocation', 'Fixed Income Value', self.extracted_data.get('fixed_income_value', '')),
-                    ('Asset Allocation', 'Fixed Income Percentage', self.extracted_data.get('fixed_income_percentage', '')),
-                    ('Asset Allocation', 'Multi-Asset Value', self.extracted_data.get('multi_asset_value', '')),
-                    ('Asset Allocation', 'Multi-Asset Percentage', self.extracted_data.get('multi_asset_percentage', '')),
-                ]
+                # Header and all fields
+                rows = [('Category', 'Field', 'Value')]
+                rows.extend((category, field, self.extracted_data.get(key, '')) for category, field, key in _CSV_SCHEMA)
                 
-                # Contributions and Performance
-                performance_fields = [
-                    ('Performance', 'Employee Contributions', self.extracted_data.get('employee_contributions', '')),
-                    ('Performance', 'Employer Contributions', self.extracted_data.get('employer_contributions', '')),
-                    ('Performance', 'Total Gains/Loss', self.extracted_data.get('total_gains_loss', '')),
-                    ('Performance', 'Personal Rate of Return', self.extracted_data.get('personal_rate_of_return', '')),
-                    ('Performance', 'Average Monthly Contribution', self.extracted_data.get('average_monthly_contribution', '')),
-                    ('Performance', 'Estimated Monthly Income at Retirement', self.extracted_data.get('estimated_monthly_income_at_retirement', '')),
-                ]
+                # Plan Details, in the same three columns as everything else
+                plans = self.extracted_data.get('plan_details') or _plan_columns()
+                plan_fields = (f"Plan {number}: {plan_type}" for number, plan_type in zip(plans['plan_number'], plans['plan_type']))
+                rows.extend(zip(repeat('Plan Details'), plan_fields, plans['balance']))
                 
-                # Vesting Information
-                vesting_fields = [
-                    ('Vesting', 'Vesting Status', self.extracted_data.get('vesting_status', '')),
-                ]
-                
-                # Write all fields
-                for category, field, value in basic_fields + balance_fields + allocation_fields + performance_fields + vesting_fields:
-                    writer.writerow([category, field, value])
-                
-                # Plan Details
-                if self.extracted_data.get('plan_details'):
-                    writer.writerow(['', '', ''])  # Empty row for separation
-                    writer.writerow(['Plan Details', 'Plan Number', 'Plan Type', 'Balance'])
-                    for plan in self.extracted_data['plan_details']:
-                        writer.writerow(['Plan Details', plan.get('plan_number', ''), plan.get('plan_type', ''), plan.get('balance', '')])
+                writer.writerows(rows)
             
             print(f"\nComprehensive data successfully saved to: {output_path}")
             return True
@@ -389,6 +799,18 @@ Regarding vesting: {data['vesting_status']} This means while personal contributi
             print(f"Error saving to CSV: {e}")
             return False
     
+    def save_to_json(self, output_path: str = "tiaa_statement_comprehensive.json"):
+        try:
+            with open(output_path, 'wb') as f:
+                f.write(_dumps(self.extracted_data, indent=True))
+            
+            print(f"Structured data saved to: {output_path}")
+            return True
+        
+        except Exception as e:
+            print(f"Error saving to JSON: {e}")
+            return False
+    
     def save_summary_to_file(self, output_path: str = "tiaa_portfolio_summary.txt"):
         try:
             summary = self.generate_portfolio_summary()
@@ -403,54 +825,129 @@ Regarding vesting: {data['vesting_status']} This means while personal contributi
             return False
     
     def print_extracted_data(self):
-        print("\n" + "="*80)
-        print("EXTRACTED DATA SUMMARY")
-        print("="*80)
+        # Collected and written in one go rather than one print call per line
+        lines = []
+        lines.append("\n" + "="*80)
+        lines.append("EXTRACTED DATA SUMMARY")
+        lines.append("="*80)
         
         # Basic Information
-        print("\nBASIC INFORMATION:")
-        print(f"  Account Holder: {self.extracted_data.get('account_holder_name', 'N/A')}")
-        print(f"  Statement Period: {self.extracted_data.get('statement_start_date', 'N/A')} to {self.extracted_data.get('statement_end_date', 'N/A')}")
+        lines.append("\nBASIC INFORMATION:")
+        lines.append(f"  Account Holder: {self.extracted_data.get('account_holder_name', 'N/A')}")
+        lines.append(f"  Statement Period: {self.extracted_data.get('statement_start_date', 'N/A')} to {self.extracted_data.get('statement_end_date', 'N/A')}")
         
         # Portfolio Performance
-        print("\nPORTFOLIO PERFORMANCE:")
-        print(f"  Beginning Balance: {self.extracted_data.get('beginning_balance', 'N/A')}")
-        print(f"  Ending Balance: {self.extracted_data.get('ending_balance', 'N/A')}")
-        print(f"  Total Gains/Loss: {self.extracted_data.get('total_gains_loss', 'N/A')}")
-        print(f"  Personal Rate of Return: {self.extracted_data.get('personal_rate_of_return', 'N/A')}")
+        lines.append("\nPORTFOLIO PERFORMANCE:")
+        lines.append(f"  Beginning Balance: {self.extracted_data.get('beginning_balance', 'N/A')}")
+        lines.append(f"  Ending Balance: {self.extracted_data.get('ending_balance', 'N/A')}")
+        lines.append(f"  Total Gains/Loss: {self.extracted_data.get('total_gains_loss', 'N/A')}")
+        lines.append(f"  Personal Rate of Return: {self.extracted_data.get('personal_rate_of_return', 'N/A')}")
         
         # Contributions
-        print("\nCONTRIBUTIONS:")
-        print(f"  Employee Contributions: {self.extracted_data.get('employee_contributions', 'N/A')}")
-        print(f"  Employer Contributions: {self.extracted_data.get('employer_contributions', 'N/A')}")
-        print(f"  Average Monthly Contribution: {self.extracted_data.get('average_monthly_contribution', 'N/A')}")
+        lines.append("\nCONTRIBUTIONS:")
+        lines.append(f"  Employee Contributions: {self.extracted_data.get('employee_contributions', 'N/A')}")
+        lines.append(f"  Employer Contributions: {self.extracted_data.get('employer_contributions', 'N/A')}")
+        lines.append(f"  Average Monthly Contribution: {self.extracted_data.get('average_monthly_contribution', 'N/A')}")
         
         # Asset Allocation
-        print("\nASSET ALLOCATION:")
-        print(f"  Equities: {self.extracted_data.get('equities_value', 'N/A')} ({self.extracted_data.get('equities_percentage', 'N/A')})")
-        print(f"  Fixed Income: {self.extracted_data.get('fixed_income_value', 'N/A')} ({self.extracted_data.get('fixed_income_percentage', 'N/A')})")
-        print(f"  Multi-Asset: {self.extracted_data.get('multi_asset_value', 'N/A')} ({self.extracted_data.get('multi_asset_percentage', 'N/A')})")
+        lines.append("\nASSET ALLOCATION:")
+        lines.append(f"  Equities: {self.extracted_data.get('equities_value', 'N/A')} ({self.extracted_data.get('equities_percentage', 'N/A')})")
+        lines.append(f"  Fixed Income: {self.extracted_data.get('fixed_income_value', 'N/A')} ({self.extracted_data.get('fixed_income_percentage', 'N/A')})")
+        lines.append(f"  Multi-Asset: {self.extracted_data.get('multi_asset_value', 'N/A')} ({self.extracted_data.get('multi_asset_percentage', 'N/A')})")
         
         # Vesting
-        print("\nVESTING STATUS:")
-        print(f"  {self.extracted_data.get('vesting_status', 'N/A')}")
+        lines.append("\nVESTING STATUS:")
+        lines.append(f"  {self.extracted_data.get('vesting_status', 'N/A')}")
         
         # Plan Details
-        if self.extracted_data.get('plan_details'):
-            print("\nPLAN BREAKDOWN:")
-            for plan in self.extracted_data['plan_details']:
-                print(f"  Plan {plan.get('plan_number', 'N/A')}: {plan.get('plan_type', 'N/A')} - {plan.get('balance', 'N/A')}")
+        plans = self.extracted_data.get('plan_details') or _plan_columns()
+        if plans['plan_number']:
+            lines.append("\nPLAN BREAKDOWN:")
+            for number, plan_type, balance in zip(plans['plan_number'], plans['plan_type'], plans['balance']):
+                lines.append(f"  Plan {number}: {plan_type} - {balance}")
         
-        print("\nRETIREMENT PROJECTION:")
-        print(f"  Estimated Monthly Income at Retirement: {self.extracted_data.get('estimated_monthly_income_at_retirement', 'N/A')}")
+        lines.append("\nRETIREMENT PROJECTION:")
+        lines.append(f"  Estimated Monthly Income at Retirement: {self.extracted_data.get('estimated_monthly_income_at_retirement', 'N/A')}")
         
-        print("="*80)
+        lines.append("="*80)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def process_one(pdf_path: str) -> Optional[Dict[str, str]]:
+    # None when no text can be read from the PDF; unlike extract_all_data,
+    # a batch never substitutes the sample data
+    extractor = TIAAStatementExtractor()
+    print(f"Extracting data from: {pdf_path}")
+    text, layout_lines = extractor.read_pdf(pdf_path)
+    if not text:
+        return None
+    return extractor.extract_from_text(text, layout_lines)
+
+def process_many(pdf_paths: List[str], max_workers: Optional[int] = None) -> List[Optional[Dict[str, str]]]:
+    # Statements are independent, so each one is parsed in its own process
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(pdf_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_one, pdf_paths, chunksize=chunksize))
+
+def _output_stems(pdf_paths: List[str]) -> List[str]:
+    # Output file prefix for each PDF. Inputs with the same name in different
+    # directories get a numeric suffix instead of overwriting each other.
+    stems = []
+    used = set()
+    for pdf_path in pdf_paths:
+        stem = candidate = Path(pdf_path).stem
+        n = 1
+        while candidate in used:
+            n += 1
+            candidate = f"{stem}_{n}"
+        used.add(candidate)
+        stems.append(candidate)
+    return stems
 
 def main():
     print("="*80)
     print("ENHANCED TIAA STATEMENT EXTRACTOR")
     print("="*80)
     
+    if _FIELD_DATABASE_ERROR:
+        print(f"Hyperscan unavailable, falling back to re: {_FIELD_DATABASE_ERROR}")
+    
+    pdf_paths = sys.argv[1:]
+    if pdf_paths:
+        print(f"Processing {len(pdf_paths)} TIAA statement(s)...")
+        results = process_many(pdf_paths)
+        extracted = [(pdf_path, data) for pdf_path, data in zip(pdf_paths, results) if data is not None]
+        failed = [pdf_path for pdf_path, data in zip(pdf_paths, results) if data is None]
+        
+        stems = _output_stems([pdf_path for pdf_path, _ in extracted])
+        for (pdf_path, data), stem in zip(extracted, stems):
+            extractor = TIAAStatementExtractor()
+            extractor.extracted_data = data
+            extractor.save_to_csv(f"{stem}_comprehensive.csv")
+            extractor.save_summary_to_file(f"{stem}_summary.txt")
+        
+        if extracted:
+            # Machine-readable copy of every statement for downstream consumers
+            save_to_ndjson([{'source_pdf': pdf_path, **data} for pdf_path, data in extracted])
+            
+            print("\nPORTFOLIO METRICS:")
+            for (pdf_path, _), metrics in zip(extracted, portfolio_metrics([data for _, data in extracted])):
+                if metrics is None:
+                    print(f"  {pdf_path}: balances not found")
+                    continue
+                change, growth_pct, gains_pct, _ = metrics
+                print(f"  {pdf_path}: {change:+,.2f} ({growth_pct:+.2f}%), gains {gains_pct:.2f}% of beginning balance")
+        
+        if failed:
+            print(f"\nSkipped {len(failed)} PDF(s) with no readable text:")
+            for pdf_path in failed:
+                print(f"  {pdf_path}")
+        
+        print("\n" + "="*80)
+        print("EXTRACTION COMPLETE")
+        print("="*80)
+        return
+    
     # Initialize extractor
     extractor = TIAAStatementExtractor()
     
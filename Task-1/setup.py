@@ -0,0 +1,15 @@
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+# Optional native build of the extractor. main.py stays plain Python and still
+# runs as a script; this compiles the same file into a C extension module:
+#
+#   python3 setup.py build_ext --inplace
+#   python3 -c "import main; main.main()"
+setup(
+    name="tiaa-statement-extractor",
+    ext_modules=cythonize(
+        [Extension("main", ["main.py"], extra_compile_args=["-O3"])],
+        compiler_directives={"language_level": 3, "boundscheck": False},
+    ),
+)
\ No newline at end of file